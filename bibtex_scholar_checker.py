@@ -5,81 +5,419 @@ Automatically checks the existence of papers in a .bibtex file using Google Scho
 """
 
 import bibtexparser
-import requests
-from bs4 import BeautifulSoup
-import time
+from bibtexparser.middlewares.parsestack import default_parse_stack
+from bibtexparser.model import DuplicateBlockKeyBlock
+import aiohttp
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from asynciolimiter import Limiter
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+from rapidfuzz import fuzz
+from rapidfuzz.utils import default_process
+import diskcache
+import functools
+import hashlib
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import random
 import re
+import time
 import argparse
 import sys
-from urllib.parse import quote_plus
-import random
+from collections import deque
+from dataclasses import asdict, dataclass
+from urllib.parse import quote, quote_plus
+
+log = logging.getLogger('bibcheck')
+
+SCHOLAR_URL = "https://scholar.google.com/scholar"
+CROSSREF_URL = "https://api.crossref.org/works"
+
+HEADERS = {
+    'Accept-Language': 'en-US,en;q=0.9'
+}
+
+# Realistic user agents to avoid blocking; one is picked per request
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:131.0) Gecko/20100101 Firefox/131.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14.7; rv:131.0) Gecko/20100101 Firefox/131.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.6 Safari/605.1.15',
+]
+
+# Seconds a proxy is left out of the rotation after it was rate-limited
+PROXY_COOLDOWN = 300
+
+# Retry policy for transient failures (mirrors urllib3's Retry semantics)
+RETRY_TOTAL = 3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+BACKOFF_FACTOR = 2
+
+# Scholar results are considered fresh for 30 days; older entries are kept
+# as a fallback while Scholar is throttling us
+CACHE_EXPIRE = 30 * 86400
+
+# Adaptive rate control (AIMD): after this many successful responses in a row
+# the rate grows by RATE_INCREASE, and a rate-limit response multiplies it by
+# RATE_DECREASE, never going below MIN_RATE requests per second
+RATE_WINDOW = 20
+RATE_INCREASE = 1.1
+RATE_DECREASE = 0.5
+MIN_RATE = 0.05
+
+# Seconds to stop querying Scholar after consecutive rate-limit responses
+COOLDOWNS = (5, 30, 300)
+
+RATE_LIMITED = "Rate limited by Google Scholar"
+
+# Result cards are rendered at the top of the page, so the first 64 KB is
+# almost always enough to tell whether a query matched
+MAX_RESPONSE_BYTES = 65536
+
+# Version of the parsed entries and queries cached per BibTeX file; bump it
+# whenever iter_entries or build_search_query changes what they produce
+ENTRY_CACHE_VERSION = 2
+
+# Files with at least this many entries build their queries in a process pool,
+# if there is more than one CPU to run it on. A query takes a few microseconds
+# to build, while a spawned worker needs about half a second to import this
+# module, so smaller files are faster serially
+PARALLEL_QUERIES_MIN_ENTRIES = 100000
+
+# Minimum rapidfuzz token_sort_ratio (case-insensitive) for a result title to
+# count as a match when several entries are checked with one batched query;
+# unlike token_set_ratio this penalises a title that is only a subset of the
+# card's title. The card's author line must also name the first author (and
+# the year, if the entry has one)
+TITLE_MATCH_THRESHOLD = 85
+
+_NONWORD_RE = re.compile(r'[^\w\s]')
+_RESULT_CARDS = CSSSelector('div.gs_r.gs_or.gs_scl')
+_RESULT_BODIES = CSSSelector('div.gs_ri')
+_RESULT_TITLES = CSSSelector('.gs_rt')
+_RESULT_AUTHORS = CSSSelector('.gs_a')
+# Leading "[PDF]", "[HTML]", "[BOOK][B]" etc. markers on card titles
+_CARD_TAGS_RE = re.compile(r'^\s*(\[[^\]]*\]\s*)+')
+
+# Byte-level equivalents of the selectors above, used unless strict parsing
+# is requested; one linear scan instead of building a DOM
+_DID_NOT_MATCH = re.compile(rb'did not match any articles', re.I)
+_GS_CARD = re.compile(rb'class=["\']gs_r gs_or gs_scl["\']')
+_GS_BODY = re.compile(rb'class=["\']gs_ri["\']')
+_NO_RESULTS = etree.XPath(
+    '//div[contains(translate(., "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"),'
+    ' "did not match any articles")]'
+)
+
+@functools.lru_cache(maxsize=4096)
+def clean_text(text):
+    """Clean text for better search matching."""
+    if not text:
+        return ""
+    # Remove special characters and normalize whitespace
+    text = _NONWORD_RE.sub(' ', text)
+    text = ' '.join(text.split())
+    return text.strip()
+
+def first_author_last_name(entry):
+    """
+    Get the last name of the first author of a BibTeX entry.
+    
+    Args:
+        entry: BibTeX entry dictionary
+        
+    Returns:
+        str: Last name, or "" if the entry has no author
+    """
+    if 'author' not in entry:
+        return ""
+    authors = entry['author'].split(' and ')
+    first_author = authors[0].strip()
+    # Extract last name
+    name_parts = first_author.split(',')
+    if len(name_parts) > 1:
+        return name_parts[0].strip()
+    name_parts = first_author.split()
+    return name_parts[-1] if name_parts else ""
+
+def build_search_query(entry):
+    """
+    Build a Google Scholar search query from a BibTeX entry.
+
+    Args:
+        entry: BibTeX entry dictionary
+
+    Returns:
+        str: Search query string
+    """
+    query_parts = []
+
+    # Add title (most important)
+    if 'title' in entry:
+        title = clean_text(entry['title'])
+        query_parts.append(f'"{title}"')
+
+    # Add first author
+    last_name = first_author_last_name(entry)
+    if last_name:
+        query_parts.append(f'author:"{last_name}"')
+
+    # Add year if available
+    if 'year' in entry:
+        query_parts.append(entry['year'])
+
+    return ' '.join(query_parts)
+
+def _ensure_log_handler():
+    """Send progress to stdout unless the application has configured logging."""
+    if log.hasHandlers():
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+
+@dataclass
+class CheckResult:
+    """Outcome of checking a single BibTeX entry."""
+    __slots__ = ('entry_id', 'title', 'query', 'found', 'num_results',
+                 'error', 'success', 'source')
+    
+    entry_id: str
+    title: str
+    query: str
+    found: bool
+    num_results: int
+    error: str
+    success: bool
+    # 'scholar' or 'crossref'
+    source: str
 
 class GoogleScholarChecker:
-    def __init__(self, delay_range=(2, 5)):
+    __slots__ = ('rate', 'limiter', 'max_rate', 'ok_streak', 'last_decrease', 'concurrency', 'batch_size', 'prefer_crossref',
+                 'user_agents', 'proxies', 'proxy_failures', 'strict_parse',
+                 'cache', 'state', 'session', 'searches')
+    
+    def __init__(self, rate=0.5, max_rate=None, concurrency=5, cache_dir='.scholar_cache', use_cache=True,
+                 batch_size=1, proxies=None, prefer_crossref=True, strict_parse=False):
         """
-        Initialize the checker with configurable delay to avoid rate limiting.
+        Initialize the checker with a configurable request rate to avoid rate limiting.
         
         Args:
-            delay_range: Tuple of (min_delay, max_delay) in seconds between requests
+            rate: Initial number of requests per second, shared by all concurrent checks
+            max_rate: Ceiling for the adaptive request rate; defaults to ``rate``
+            concurrency: Maximum number of requests in flight at once
+            cache_dir: Directory of the on-disk query result cache
+            use_cache: Whether to read and write the query result cache
+            batch_size: Number of entries to probe with a single OR'd title query
+            proxies: Optional list of proxy URLs to rotate through
+            prefer_crossref: Resolve entries with a DOI via Crossref before
+                falling back to Google Scholar
+            strict_parse: Parse result pages with lxml instead of scanning
+                the raw bytes for result markers
         """
-        self.delay_range = delay_range
-        self.session = requests.Session()
-        # Set a realistic user agent to avoid blocking
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.max_rate = max_rate or rate
+        # The adaptive rate never starts above its ceiling
+        self.rate = min(rate, self.max_rate)
+        # Created per run in check_bibtex_file_async; its timers belong to
+        # that run's event loop
+        self.limiter = None
+        self.ok_streak = 0
+        # time.monotonic() of the last rate decrease
+        self.last_decrease = float('-inf')
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.prefer_crossref = prefer_crossref
+        self.strict_parse = strict_parse
+        self.user_agents = USER_AGENTS
+        self.proxies = deque(proxies or [])
+        # Proxy URL -> time it was last rate-limited
+        self.proxy_failures = {}
+        self.cache = diskcache.Cache(cache_dir) if use_cache else None
+        # Throttling state lives in the cache so it carries over between runs
+        self.state = self.cache if self.cache is not None else {}
+        # Created per run in check_bibtex_file_async
+        self.session = None
+        # Query -> search task for the current run, so identical queries
+        # from different entries share one lookup
+        self.searches = {}
         
-    def clean_text(self, text):
-        """Clean text for better search matching."""
-        if not text:
-            return ""
-        # Remove special characters and normalize whitespace
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = ' '.join(text.split())
-        return text.strip()
+    def _retry_delay(self, attempt, response):
+        """Seconds to wait before retry number ``attempt`` (0-based)."""
+        delay = BACKOFF_FACTOR * 2 ** attempt
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            delay = max(delay, int(retry_after))
+        return delay
     
-    def build_search_query(self, entry):
+    async def fetch(self, url, max_bytes=None, evaluate=None):
         """
-        Build a Google Scholar search query from a BibTeX entry.
+        GET a URL over the shared session, retrying transient failures.
+        
+        Statuses in RETRY_STATUSES are retried up to RETRY_TOTAL times with
+        exponential backoff, honouring any Retry-After header, and every
+        response feeds the adaptive rate control (see _adapt_rate). Each attempt
+        uses a random user agent and, if proxies are configured, the next
+        healthy proxy; a proxy that gets rate-limited sits out the rotation
+        for PROXY_COOLDOWN seconds.
         
         Args:
-            entry: BibTeX entry dictionary
+            url: URL to fetch
+            max_bytes: If set, stop reading the body after this many bytes
+            evaluate: Optional function run on the body of a 200 response,
+                returning a ``(value, conclusive)`` pair; when a truncated
+                body is not conclusive the rest is read and evaluated instead
             
         Returns:
-            str: Search query string
+            tuple: (status: int, content: bytes, evaluation) where evaluation
+            is the result of ``evaluate`` on the returned content, or None
+        """
+        attempt = 0
+        sent_at = None
+        while True:
+            # Wait for a slot from the shared rate limiter
+            await self.limiter.wait()
+            
+            headers = {'User-Agent': random.choice(self.user_agents)}
+            proxy = self._next_proxy()
+            # Retries are part of the same congestion event as the first attempt
+            if sent_at is None:
+                sent_at = time.monotonic()
+            try:
+                response = await self.session.get(url, headers=headers, proxy=proxy,
+                                                  timeout=aiohttp.ClientTimeout(total=10))
+            except aiohttp.ClientConnectionError:
+                if not proxy or attempt >= RETRY_TOTAL:
+                    raise
+                # Unreachable proxy: take it out of the rotation and retry
+                self.proxy_failures[proxy] = time.time()
+                attempt += 1
+                continue
+            
+            async with response:
+                # Google answers a CAPTCHA challenge by redirecting to /sorry/
+                status = 429 if '/sorry/' in response.url.path else response.status
+                self._adapt_rate(status, sent_at)
+                if status == 429 and proxy:
+                    # Rotate away from the blocked proxy for the retry
+                    self.proxy_failures[proxy] = time.time()
+                if status not in RETRY_STATUSES or attempt >= RETRY_TOTAL:
+                    if max_bytes is None:
+                        content = await response.read()
+                    else:
+                        content = await self._read_capped(response, max_bytes)
+                    if evaluate is None or status != 200:
+                        return status, content, None
+                    evaluation = evaluate(content)
+                    if not evaluation[1] and not response.content.at_eof():
+                        content += await response.content.read()
+                        evaluation = evaluate(content)
+                    return status, content, evaluation
+                delay = self._retry_delay(attempt, response)
+            
+            attempt += 1
+            await asyncio.sleep(delay)
+    
+    def _adapt_rate(self, status, sent_at):
+        """
+        Grow the request rate while Scholar answers 200s, halve it on a 429.
+        
+        A burst of 429s for requests that were already in flight, and their
+        retries, is one congestion event, so a 429 only lowers the rate if
+        its request was first sent after the last decrease.
+        
+        Args:
+            status: Response status, 429 for a CAPTCHA redirect
+            sent_at: time.monotonic() when the first attempt was sent
         """
-        query_parts = []
+        old_rate = self.rate
+        if status == 200:
+            self.ok_streak += 1
+            if self.ok_streak % RATE_WINDOW == 0:
+                self.rate = min(self.max_rate, old_rate * RATE_INCREASE)
+        elif status == 429:
+            self.ok_streak = 0
+            if sent_at > self.last_decrease:
+                self.rate = max(MIN_RATE, old_rate * RATE_DECREASE)
+                self.last_decrease = time.monotonic()
+        if self.rate != old_rate:
+            self.limiter.rate = self.rate
+            log.info("Request rate: %.3f -> %.3f requests/second", old_rate, self.rate)
+    
+    def _next_proxy(self):
+        """Return the next proxy in the rotation, preferring healthy ones."""
+        if not self.proxies:
+            return None
+        now = time.time()
+        for _ in range(len(self.proxies)):
+            self.proxies.rotate(-1)
+            proxy = self.proxies[0]
+            if now - self.proxy_failures.get(proxy, 0) >= PROXY_COOLDOWN:
+                return proxy
+        # Every proxy is cooling down; use the one that failed longest ago
+        return min(self.proxies, key=lambda p: self.proxy_failures.get(p, 0))
+    
+    def _has_healthy_proxy(self):
+        """Whether some configured proxy is not cooling down."""
+        now = time.time()
+        return any(now - self.proxy_failures.get(proxy, 0) >= PROXY_COOLDOWN
+                   for proxy in self.proxies)
+    
+    async def _read_capped(self, response, max_bytes):
+        """Read at most max_bytes of a (decompressed) response body."""
+        content = b''
+        while len(content) < max_bytes:
+            chunk = await response.content.read(max_bytes - len(content))
+            if not chunk:
+                break
+            content += chunk
+        return content
+    
+    def _count_results(self, content):
+        """
+        Count result cards in a (possibly truncated) Scholar results page.
         
-        # Add title (most important)
-        if 'title' in entry:
-            title = self.clean_text(entry['title'])
-            query_parts.append(f'"{title}"')
+        Returns:
+            tuple: (num_results: int, conclusive: bool) where conclusive is
+            False if the page showed neither result cards nor a "no
+            results" message
+        """
+        if not self.strict_parse:
+            if _DID_NOT_MATCH.search(content):
+                return 0, True
+            num_results = len(_GS_CARD.findall(content)) or len(_GS_BODY.findall(content))
+            return num_results, num_results > 0
         
-        # Add first author
-        if 'author' in entry:
-            authors = entry['author'].split(' and ')
-            if authors:
-                first_author = authors[0].strip()
-                # Extract last name
-                name_parts = first_author.split(',')
-                if len(name_parts) > 1:
-                    last_name = name_parts[0].strip()
-                else:
-                    name_parts = first_author.split()
-                    last_name = name_parts[-1] if name_parts else ""
-                
-                if last_name:
-                    query_parts.append(f'author:"{last_name}"')
+        if not content.strip():
+            return 0, False
+        doc = lxml_html.fromstring(content)
         
-        # Add year if available
-        if 'year' in entry:
-            query_parts.append(entry['year'])
+        # Check for "no results" message
+        if _NO_RESULTS(doc):
+            return 0, True
         
-        return ' '.join(query_parts)
+        # Check if we got results
+        result_divs = _RESULT_CARDS(doc) or _RESULT_BODIES(doc)
+        return len(result_divs), len(result_divs) > 0
     
-    def search_google_scholar(self, query):
+    async def search_google_scholar(self, query):
         """
-        Search Google Scholar for a given query.
+        Search Google Scholar for a given query, consulting the disk cache first.
+        
+        Successful lookups are cached so reruns only query entries that are
+        new, whose last lookup failed, or whose cached result is older than
+        CACHE_EXPIRE. When Scholar rate-limits us, queries are suspended for
+        a growing cooldown (see COOLDOWNS) and the last known result is
+        returned instead, even if it has expired. Within a run, identical
+        queries (e.g. a preprint and its published version) share a single
+        lookup.
         
         Args:
             query: Search query string
@@ -87,142 +425,627 @@ class GoogleScholarChecker:
         Returns:
             tuple: (success: bool, num_results: int, error_msg: str)
         """
-        try:
-            url = f"https://scholar.google.com/scholar?q={quote_plus(query)}"
-            
-            # Add random delay to avoid rate limiting
-            delay = random.uniform(*self.delay_range)
-            time.sleep(delay)
-            
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 429:
-                return False, 0, "Rate limited by Google Scholar"
-            elif response.status_code != 200:
-                return False, 0, f"HTTP {response.status_code}"
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+        task = self.searches.get(query)
+        if task is None:
+            task = self.searches[query] = asyncio.ensure_future(self._search(query))
+        # Shield the shared task so one cancelled caller doesn't cancel the rest
+        return await asyncio.shield(task)
+    
+    async def _search(self, query):
+        """Look up a single query; see search_google_scholar."""
+        result, stale = self._cached(query)
+        if result is not None:
+            return result
+        
+        # While cooling down after a rate limit, don't send anything to Scholar
+        if self._throttled():
+            return stale or (False, 0, RATE_LIMITED)
+        
+        result = await self._query_scholar(query)
+        if result[2] == RATE_LIMITED:
+            self._record_rate_limit()
+            return stale or result
+        
+        if result[0]:
+            self.state['fail_count'] = 0
+            self._store(query, result)
+        return result
+    
+    async def search_batch(self, queries, entries):
+        """
+        Search Google Scholar for several entries with as few requests as possible.
+        
+        Entries not answered by the cache are first probed together with one
+        query OR-ing their titles; a result card matches an entry when its
+        title fuzzy-matches the entry's title and its author line names the
+        entry's first author and year. Entries without a matching card
+        (Scholar caps the cards per page, so some may be crowded out) fall
+        back to their own query via search_google_scholar. Batch matches are
+        cached under their own key, not under the per-entry query.
+        
+        Args:
+            queries: Per-entry search query strings
+            entries: Per-entry BibTeX entry dictionaries
             
-            # Check if we got results
-            result_divs = soup.find_all('div', {'class': 'gs_r gs_or gs_scl'}) or \
-                         soup.find_all('div', {'class': 'gs_ri'})
+        Returns:
+            list: One (success, num_results, error_msg) tuple per entry
+        """
+        match_keys = ["match:" + "|".join((clean_text(entry.get('title', '')).lower(),
+                                           first_author_last_name(entry).lower(),
+                                           entry.get('year', '')))
+                      for entry in entries]
+        outcomes = [self._cached(query)[0] or self._cached(match_key)[0]
+                    for query, match_key in zip(queries, match_keys)]
+        pending = [k for k, outcome in enumerate(outcomes)
+                   if outcome is None and clean_text(entries[k].get('title', ''))]
+        
+        if len(pending) > 1 and not self._throttled():
+            matches = await self._query_scholar_titles([entries[k] for k in pending])
+            for k, num_results in zip(pending, matches):
+                if num_results:
+                    outcomes[k] = (True, num_results, "")
+                    self._store(match_keys[k], outcomes[k])
+        
+        for k, outcome in enumerate(outcomes):
+            if outcome is None:
+                outcomes[k] = await self.search_google_scholar(queries[k])
+        return outcomes
+    
+    async def check_doi(self, doi):
+        """
+        Check whether a DOI is registered with Crossref.
+        
+        Crossref has a real API with generous rate limits, so this goes over
+        the shared session but around the Scholar rate limiter and proxies.
+        Resolved DOIs are cached like Scholar lookups.
+        
+        Args:
+            doi: DOI, optionally as a https://doi.org/ URL
             
-            # Check for "no results" message
-            no_results = soup.find('div', string=re.compile(r'did not match any articles', re.I))
+        Returns:
+            bool: True if Crossref knows the DOI; False if it does not or the
+            lookup failed
+        """
+        doi = re.sub(r'^(https?://(dx\.)?doi\.org/|doi:)', '', doi.strip(), flags=re.I)
+        cache_query = f"doi:{doi.lower()}"
+        if self._cached(cache_query)[0] is not None:
+            return True
+        
+        try:
+            url = f"{CROSSREF_URL}/{quote(doi, safe='/')}"
+            async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status != 200:
+                    return False
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+        
+        self._store(cache_query, (True, 1, ""))
+        return True
+    
+    def _cached(self, query):
+        """
+        Look up a query in the result cache.
+        
+        Returns:
+            tuple: (fresh result or None, last known result or None)
+        """
+        if self.cache is None:
+            return None, None
+        cached = self.cache.get(hashlib.sha1(query.encode()).hexdigest())
+        if cached is None:
+            return None, None
+        cached_ts, result = cached
+        if time.time() - cached_ts < CACHE_EXPIRE:
+            return result, result
+        return None, result
+    
+    def _store(self, query, result):
+        """Record a successful lookup in the result cache."""
+        if self.cache is not None:
+            self.cache.set(hashlib.sha1(query.encode()).hexdigest(), (time.time(), result))
+    
+    def _throttled(self):
+        """Whether we are still inside the cooldown after the last rate limit."""
+        fail_count = self.state.get('fail_count', 0)
+        if not fail_count:
+            return False
+        cooldown = COOLDOWNS[min(fail_count, len(COOLDOWNS)) - 1]
+        return time.time() - self.state.get('last_fail_ts', 0) < cooldown
+    
+    def _record_rate_limit(self):
+        """Start (or lengthen) the cooldown after a rate-limit response."""
+        if self._has_healthy_proxy():
+            # Only the proxy was blocked; keep going through the others
+            return
+        self.state['fail_count'] = self.state.get('fail_count', 0) + 1
+        self.state['last_fail_ts'] = time.time()
+    
+    async def _query_scholar(self, query):
+        """Send a single query to Google Scholar; see search_google_scholar."""
+        try:
+            url = f"{SCHOLAR_URL}?q={quote_plus(query)}"
             
-            if no_results or len(result_divs) == 0:
-                return True, 0, ""
+            status, _, evaluation = await self.fetch(
+                url, max_bytes=MAX_RESPONSE_BYTES, evaluate=self._count_results)
+            if status == 429:
+                return False, 0, RATE_LIMITED
+            elif status != 200:
+                return False, 0, f"HTTP {status}"
             
-            return True, len(result_divs), ""
+            num_results, _ = evaluation
+            return True, num_results, ""
             
-        except requests.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             return False, 0, f"Network error: {str(e)}"
         except Exception as e:
             return False, 0, f"Error: {str(e)}"
     
+    def iter_entries(self, bibtex_file_path):
+        """
+        Parse a BibTeX file and yield its entries.
+        
+        Uses the bibtexparser v2 parser with only its default middleware,
+        and yields each entry as a dictionary in the v1 layout (``ID``,
+        ``ENTRYTYPE`` and lower-cased field names) used by the rest of the
+        checker. v2 sets aside entries whose key repeats an earlier one;
+        like the v1 parser, those are still yielded, in file order.
+        
+        Args:
+            bibtex_file_path: Path to the BibTeX file
+            
+        Yields:
+            dict: BibTeX entry dictionary
+        """
+        library = bibtexparser.parse_file(bibtex_file_path, append_middleware=[])
+        
+        entries = list(library.entries)
+        unparseable = 0
+        for block in library.failed_blocks:
+            if not isinstance(block, DuplicateBlockKeyBlock):
+                unparseable += 1
+                continue
+            log.warning("Duplicate BibTeX key %s (line %d); checking it as well",
+                        block.key, block.start_line + 1)
+            # Failed blocks bypass the parse stack, so run it on a library
+            # holding just this entry (plus the @string definitions)
+            duplicate = bibtexparser.Library(list(library.strings) + [block.ignore_error_block])
+            for middleware in default_parse_stack():
+                duplicate = middleware.transform(duplicate)
+            entries.extend(duplicate.entries)
+        if unparseable:
+            log.warning("Skipped %d unparseable BibTeX blocks", unparseable)
+        entries.sort(key=lambda entry: entry.start_line)
+        
+        for entry in entries:
+            fields = {field.key.lower(): field.value for field in entry.fields}
+            fields['ID'] = entry.key
+            fields['ENTRYTYPE'] = entry.entry_type
+            yield fields
+    
+    def load_entries(self, bibtex_file_path):
+        """
+        Load the entries of a BibTeX file together with their search queries.
+        
+        Parsed entries and built queries are kept in the disk cache, keyed by
+        the file's path and checked against its mtime, size and
+        ENTRY_CACHE_VERSION, so an unchanged file is neither re-parsed nor
+        re-processed on later runs. Large files build their queries in a
+        pool of spawned processes (forking would copy the threads of the
+        caller, e.g. a logging QueueListener) on machines with several CPUs.
+        
+        Args:
+            bibtex_file_path: Path to the BibTeX file
+            
+        Returns:
+            tuple: (entries: list of dict, queries: list of str)
+        """
+        stat = os.stat(bibtex_file_path)
+        signature = (ENTRY_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+        key = ('bibfile', os.path.abspath(bibtex_file_path))
+        
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None and cached[0] == signature:
+                return cached[1], cached[2]
+        
+        entries = list(self.iter_entries(bibtex_file_path))
+        if len(entries) >= PARALLEL_QUERIES_MIN_ENTRIES and (os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as executor:
+                queries = list(executor.map(build_search_query, entries, chunksize=256))
+        else:
+            queries = [build_search_query(entry) for entry in entries]
+        
+        if self.cache is not None:
+            self.cache.set(key, (signature, entries, queries))
+        return entries, queries
+    
+    async def _query_scholar_titles(self, entries):
+        """
+        Send one Google Scholar query matching any of several entries' titles.
+        
+        Args:
+            entries: BibTeX entry dictionaries whose titles are OR'd together
+            
+        Returns:
+            list: Number of result cards matching each entry; all zeros if
+            the request failed
+        """
+        titles = [clean_text(entry.get('title', '')) for entry in entries]
+        query = ' OR '.join(f'"{title}"' for title in dict.fromkeys(titles))
+        try:
+            status, content, _ = await self.fetch(f"{SCHOLAR_URL}?q={quote_plus(query)}")
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return [0] * len(titles)
+        if status == 429:
+            self._record_rate_limit()
+        if status != 200 or not content.strip():
+            return [0] * len(titles)
+        self.state['fail_count'] = 0
+        
+        doc = lxml_html.fromstring(content)
+        cards = []
+        for body in _RESULT_BODIES(doc):
+            card_title = ' '.join(node.text_content() for node in _RESULT_TITLES(body))
+            byline = ' '.join(node.text_content() for node in _RESULT_AUTHORS(body))
+            cards.append((clean_text(_CARD_TAGS_RE.sub('', card_title)),
+                          f" {default_process(byline)} "))
+        
+        matches = []
+        for entry, title in zip(entries, titles):
+            # Padded so names and years only match as whole words
+            required = [f" {default_process(term)} "
+                        for term in (first_author_last_name(entry), entry.get('year', ''))
+                        if default_process(term)]
+            matches.append(sum(
+                1 for card_title, byline in cards
+                if fuzz.token_sort_ratio(title, card_title, processor=default_process)
+                >= TITLE_MATCH_THRESHOLD
+                and all(term in byline for term in required)))
+        return matches
+    
     def check_bibtex_file(self, bibtex_file_path, output_file=None):
+        """Synchronous wrapper around check_bibtex_file_async."""
+        return asyncio.run(self.check_bibtex_file_async(bibtex_file_path, output_file))
+    
+    async def check_entries(self, batch, total, queries):
+        """
+        Check a batch of BibTeX entries against Google Scholar.
+        
+        Args:
+            batch: List of (i, entry) pairs, i being the 1-based position of
+                the entry in the file
+            total: Total number of entries
+            queries: Search queries for all entries, by position
+            
+        Returns:
+            list: CheckResult for each entry in the batch
+        """
+        batch_queries = [queries[i - 1] for i, _ in batch]
+        outcomes = [None] * len(batch)
+        sources = ['scholar'] * len(batch)
+        
+        # Entries with a DOI Crossref knows about don't need Scholar at all
+        if self.prefer_crossref:
+            for k, (_, entry) in enumerate(batch):
+                if entry.get('doi') and await self.check_doi(entry['doi']):
+                    outcomes[k] = (True, 1, "")
+                    sources[k] = 'crossref'
+        
+        # Search Google Scholar
+        remaining = [k for k, outcome in enumerate(outcomes) if outcome is None]
+        if len(remaining) > 1:
+            scholar_outcomes = await self.search_batch(
+                [batch_queries[k] for k in remaining],
+                [batch[k][1] for k in remaining])
+        elif remaining:
+            scholar_outcomes = [await self.search_google_scholar(batch_queries[remaining[0]])]
+        else:
+            scholar_outcomes = []
+        for k, outcome in zip(remaining, scholar_outcomes):
+            outcomes[k] = outcome
+        
+        return [self._make_result(i, total, entry, query, outcome, source)
+                for (i, entry), query, outcome, source
+                in zip(batch, batch_queries, outcomes, sources)]
+    
+    def _make_result(self, i, total, entry, query, outcome, source='scholar'):
+        """Build and log the check result for one entry."""
+        success, num_results, error_msg = outcome
+        entry_id = entry.get('ID', f'entry_{i}')
+        title = entry.get('title', 'No title')
+        
+        result = CheckResult(
+            entry_id=entry_id,
+            title=title,
+            query=query,
+            found=success and num_results > 0,
+            num_results=num_results if success else 0,
+            error=error_msg,
+            success=success,
+            source=source,
+        )
+        
+        if source == 'crossref':
+            status = "✓ FOUND (DOI registered with Crossref)"
+        elif success:
+            status = "✓ FOUND" if num_results > 0 else "✗ NOT FOUND"
+            status = f"{status} ({num_results} results)"
+        else:
+            status = f"ERROR - {error_msg}"
+        log.info("[%d/%d] %s %s -> %s", i, total, entry_id, title[:60], status)
+        
+        return result
+    
+    async def check_bibtex_file_async(self, bibtex_file_path, output_file=None):
         """
         Check all entries in a BibTeX file against Google Scholar.
         
+        Up to ``self.concurrency`` queries are in flight at once over a
+        single shared ClientSession. When an output file is given, the
+        report is written as results come in, and each result is also
+        appended to ``{output_file}.partial.jsonl``; an interrupted run picks
+        up from that checkpoint and only re-checks entries that are missing
+        or failed.
+        
+        Progress is logged at INFO on the ``bibcheck`` logger. If the caller
+        has not configured logging, it is printed to stdout as before.
+        
         Args:
             bibtex_file_path: Path to the BibTeX file
             output_file: Optional path to save results
             
         Returns:
-            list: List of dictionaries containing check results
+            list: CheckResult for each entry, in file order
         """
-        print(f"Loading BibTeX file: {bibtex_file_path}")
+        _ensure_log_handler()
+        log.info("Loading BibTeX file: %s", bibtex_file_path)
         
         try:
-            with open(bibtex_file_path, 'r', encoding='utf-8') as bibtex_file:
-                bib_database = bibtexparser.load(bibtex_file)
+            # Parsing a large file takes a while; keep the event loop free meanwhile
+            entries, queries = await asyncio.get_running_loop().run_in_executor(
+                None, self.load_entries, bibtex_file_path)
         except Exception as e:
-            print(f"Error loading BibTeX file: {e}")
+            log.error("Error loading BibTeX file: %s", e)
             return []
         
-        entries = bib_database.entries
-        print(f"Found {len(entries)} entries to check")
+        log.info("Found %d entries to check", len(entries))
         
-        results = []
+        partial_file = f"{output_file}.partial.jsonl" if output_file else None
+        done = self.load_checkpoint(partial_file) if partial_file else {}
+        if done:
+            log.info("Resuming: %d entries already checked", len(done))
         
-        for i, entry in enumerate(entries, 1):
-            entry_id = entry.get('ID', f'entry_{i}')
-            title = entry.get('title', 'No title')
-            
-            print(f"\n[{i}/{len(entries)}] Checking: {entry_id}")
-            print(f"Title: {title}")
-            
-            # Build search query
-            query = self.build_search_query(entry)
-            print(f"Query: {query}")
+        # Keys may repeat in a file, so checkpointed results are matched on
+        # (entry_id, query)
+        pending = [(i, entry) for i, entry in enumerate(entries, 1)
+                   if (entry.get('ID', f'entry_{i}'), queries[i - 1]) not in done]
+        batches = [pending[start:start + self.batch_size]
+                   for start in range(0, len(pending), self.batch_size)]
+        
+        report = None
+        checkpoint = None
+        if output_file:
+            try:
+                report = open(output_file, 'w', encoding='utf-8')
+                self._write_report_header(report)
+                checkpoint = self._open_checkpoint(partial_file, done.values())
+            except OSError as e:
+                # Check the entries anyway, just without a report or checkpoint
+                log.error("Error saving results: %s", e)
+                if report:
+                    report.close()
+                    report = None
+        
+        results = [None] * len(entries)
+        found_count = 0
+        
+        def record(i, result, resumed=False):
+            nonlocal found_count
+            results[i - 1] = result
+            found_count += result.found
+            if checkpoint and not resumed:
+                checkpoint.write(json.dumps(asdict(result)) + "\n")
+                checkpoint.flush()
+            if report:
+                self._write_result(report, result)
+        
+        try:
+            for i, entry in enumerate(entries, 1):
+                key = (entry.get('ID', f'entry_{i}'), queries[i - 1])
+                if key in done:
+                    record(i, done[key], resumed=True)
             
-            # Search Google Scholar
-            success, num_results, error_msg = self.search_google_scholar(query)
+            # One keep-alive pool so every query reuses the same TCP+TLS connections
+            connector = aiohttp.TCPConnector(limit_per_host=self.concurrency,
+                                             keepalive_timeout=60,
+                                             ttl_dns_cache=300)
+            async with aiohttp.ClientSession(headers=HEADERS, connector=connector) as session:
+                self.session = session
+                self.searches = {}
+                self.limiter = Limiter(self.rate)
+                try:
+                    async for i, result in self._iter_results(batches, len(entries), queries):
+                        record(i, result)
+                finally:
+                    self.limiter.close()
+                    self.limiter = None
+                    self.session = None
+                    self.searches = {}
             
-            result = {
-                'entry_id': entry_id,
-                'title': title,
-                'query': query,
-                'found': success and num_results > 0,
-                'num_results': num_results if success else 0,
-                'error': error_msg,
-                'success': success
-            }
+            if report:
+                self._write_report_summary(report, found_count, len(entries))
+        finally:
+            if checkpoint:
+                checkpoint.close()
+            if report:
+                report.close()
+        
+        # The checkpoint is only needed until the full report is on disk
+        if report:
+            log.info("Results saved to: %s", output_file)
+            os.remove(partial_file)
+        
+        return results
+    
+    async def _iter_results(self, batches, total, queries):
+        """
+        Check batches of entries concurrently, yielding results as they finish.
+        
+        Batches are queued up front and drained by ``self.concurrency``
+        worker tasks, so the number of tasks stays fixed however large the
+        file is.
+        
+        Args:
+            batches: Lists of (i, entry) pairs to check together
+            total: Total number of entries
+            queries: Search queries for all entries, by position
             
-            results.append(result)
+        Yields:
+            tuple: (i, CheckResult) for every entry in every batch
+        """
+        jobs = asyncio.Queue()
+        for batch in batches:
+            jobs.put_nowait(batch)
+        finished = asyncio.Queue()
+        
+        async def worker():
+            while not jobs.empty():
+                batch = jobs.get_nowait()
+                try:
+                    batch_results = await self.check_entries(batch, total, queries)
+                except Exception as e:
+                    batch_results = [self._error_result(i, entry, queries[i - 1], e)
+                                     for i, entry in batch]
+                finished.put_nowait((batch, batch_results))
+        
+        workers = [asyncio.create_task(worker())
+                   for _ in range(min(self.concurrency, len(batches)))]
+        try:
+            for _ in range(len(batches)):
+                batch, batch_results = await finished.get()
+                for (i, _), result in zip(batch, batch_results):
+                    yield i, result
+        finally:
+            for task in workers:
+                task.cancel()
+    
+    def _error_result(self, i, entry, query, error):
+        """Build the check result for an entry whose check raised."""
+        return CheckResult(
+            entry_id=entry.get('ID', f'entry_{i}'),
+            title=entry.get('title', 'No title'),
+            query=query,
+            found=False,
+            num_results=0,
+            error=f"Error: {error}",
+            success=False,
+            source='scholar',
+        )
+    
+    def load_checkpoint(self, partial_file):
+        """
+        Load successfully checked entries from a checkpoint file.
+        
+        Args:
+            partial_file: Path to the JSON-lines checkpoint
             
-            if success:
-                status = "✓ FOUND" if num_results > 0 else "✗ NOT FOUND"
-                print(f"Status: {status} ({num_results} results)")
-            else:
-                print(f"Status: ERROR - {error_msg}")
+        Returns:
+            dict: Mapping of (entry_id, query) to its recorded result
+        """
+        done = {}
+        if not os.path.exists(partial_file):
+            return done
+        with open(partial_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    # Last line may be truncated if the run was killed mid-write
+                    continue
+                if result.get('success'):
+                    result.setdefault('source', 'scholar')
+                    done[result['entry_id'], result['query']] = CheckResult(**result)
+        return done
+    
+    def _open_checkpoint(self, partial_file, results):
+        """
+        Rewrite a checkpoint file with just the given results and open it for appending.
         
-        # Save results if output file specified
-        if output_file:
-            self.save_results(results, output_file)
+        A run killed mid-write can leave a truncated last line, which would
+        otherwise swallow the first record appended after it.
         
-        return results
+        Args:
+            partial_file: Path to the JSON-lines checkpoint
+            results: CheckResults to keep, typically from load_checkpoint
+            
+        Returns:
+            file: The checkpoint, opened for appending
+        """
+        tmp_file = f"{partial_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(asdict(result)) + "\n")
+        os.replace(tmp_file, partial_file)
+        return open(partial_file, 'a', encoding='utf-8')
+    
+    def _write_report_header(self, f):
+        """Write the report title."""
+        f.write("BibTeX Google Scholar Check Results\n")
+        f.write("=" * 50 + "\n\n")
+    
+    def _write_result(self, f, result):
+        """Append one result record to the report and flush it to disk."""
+        if result.source == 'crossref':
+            status = "FOUND (DOI registered with Crossref)"
+        elif result.success:
+            status = "FOUND" if result.found else "NOT FOUND"
+            status = f"{status} ({result.num_results} results)"
+        else:
+            status = f"ERROR - {result.error}"
+        f.write('\n'.join((
+            f"Entry ID: {result.entry_id}",
+            f"Title: {result.title}",
+            f"Query: {result.query}",
+            f"Status: {status}",
+            "-" * 30,
+            "\n",
+        )))
+        f.flush()
+    
+    def _write_report_summary(self, f, found_count, total_count):
+        """Write the closing summary line of the report."""
+        f.write(f"Summary: {found_count}/{total_count} entries found\n")
     
     def save_results(self, results, output_file):
-        """Save results to a file."""
+        """Save results to a file. Returns True if the file was written."""
         try:
             with open(output_file, 'w', encoding='utf-8') as f:
-                f.write("BibTeX Google Scholar Check Results\n")
-                f.write("=" * 50 + "\n\n")
-                
-                found_count = sum(1 for r in results if r['found'])
-                total_count = len(results)
-                
-                f.write(f"Summary: {found_count}/{total_count} entries found\n\n")
-                
+                self._write_report_header(f)
+                found_count = 0
                 for result in results:
-                    f.write(f"Entry ID: {result['entry_id']}\n")
-                    f.write(f"Title: {result['title']}\n")
-                    f.write(f"Query: {result['query']}\n")
-                    
-                    if result['success']:
-                        status = "FOUND" if result['found'] else "NOT FOUND"
-                        f.write(f"Status: {status} ({result['num_results']} results)\n")
-                    else:
-                        f.write(f"Status: ERROR - {result['error']}\n")
-                    
-                    f.write("-" * 30 + "\n\n")
+                    found_count += result.found
+                    self._write_result(f, result)
+                self._write_report_summary(f, found_count, len(results))
             
-            print(f"\nResults saved to: {output_file}")
+            log.info("Results saved to: %s", output_file)
+            return True
         except Exception as e:
-            print(f"Error saving results: {e}")
+            log.error("Error saving results: %s", e)
+            return False
     
     def print_summary(self, results):
         """Print a summary of the check results."""
         total = len(results)
-        found = sum(1 for r in results if r['found'])
-        errors = sum(1 for r in results if not r['success'])
+        found = sum(1 for r in results if r.found)
+        crossref = sum(1 for r in results if r.source == 'crossref')
+        errors = sum(1 for r in results if not r.success)
         
         print(f"\n" + "=" * 50)
         print("SUMMARY")
         print("=" * 50)
         print(f"Total entries checked: {total}")
-        print(f"Found in Google Scholar: {found}")
+        print(f"Found in Google Scholar: {found - crossref}")
+        print(f"Found via Crossref DOI: {crossref}")
         print(f"Not found: {total - found - errors}")
         print(f"Errors: {errors}")
         print(f"Success rate: {found/total*100:.1f}%" if total > 0 else "N/A")
@@ -230,35 +1053,85 @@ class GoogleScholarChecker:
         if errors > 0:
             print(f"\nEntries with errors:")
             for result in results:
-                if not result['success']:
-                    print(f"  - {result['entry_id']}: {result['error']}")
+                if not result.success:
+                    print(f"  - {result.entry_id}: {result.error}")
 
 def main():
     parser = argparse.ArgumentParser(description='Check BibTeX entries against Google Scholar')
     parser.add_argument('bibtex_file', help='Path to the BibTeX file')
     parser.add_argument('-o', '--output', help='Output file to save results')
-    parser.add_argument('--min-delay', type=float, default=2.0, 
-                       help='Minimum delay between requests (seconds)')
-    parser.add_argument('--max-delay', type=float, default=5.0,
-                       help='Maximum delay between requests (seconds)')
+    parser.add_argument('--rate', type=float, default=0.5,
+                       help='Initial number of requests per second')
+    parser.add_argument('--max-rate', type=float,
+                       help='Ceiling for the adaptive request rate (default: --rate)')
+    parser.add_argument('--concurrency', type=int, default=5,
+                       help='Maximum number of requests in flight at once')
+    parser.add_argument('--cache-dir', default='.scholar_cache',
+                       help='Directory of the on-disk query result cache')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not read or write the query result cache')
+    parser.add_argument('--batch-size', type=int, default=1,
+                       help='Number of entries to probe with a single OR\'d title query')
+    parser.add_argument('--prefer-crossref', action=argparse.BooleanOptionalAction, default=True,
+                       help='Resolve entries with a DOI via Crossref before querying Google Scholar')
+    parser.add_argument('--strict-parse', action='store_true',
+                       help='Parse result pages with lxml instead of a fast byte scan')
+    parser.add_argument('--proxies',
+                       help='File with one proxy URL per line to rotate through')
     
     args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error("--rate must be greater than 0")
+    if args.max_rate is not None and args.max_rate <= 0:
+        parser.error("--max-rate must be greater than 0")
+    if args.max_rate is not None and args.max_rate < args.rate:
+        parser.error("--max-rate must not be lower than --rate")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
     
     if not args.bibtex_file:
         print("Error: Please provide a BibTeX file path")
         sys.exit(1)
     
+    proxies = []
+    if args.proxies:
+        with open(args.proxies, 'r', encoding='utf-8') as f:
+            proxies = [line.strip() for line in f
+                       if line.strip() and not line.startswith('#')]
+    
     # Create checker instance
-    checker = GoogleScholarChecker(delay_range=(args.min_delay, args.max_delay))
+    checker = GoogleScholarChecker(rate=args.rate, max_rate=args.max_rate,
+                                   concurrency=args.concurrency,
+                                   cache_dir=args.cache_dir, use_cache=not args.no_cache,
+                                   batch_size=args.batch_size, proxies=proxies,
+                                   prefer_crossref=args.prefer_crossref,
+                                   strict_parse=args.strict_parse)
     
     print("BibTeX Google Scholar Checker")
     print("=" * 50)
     print("This tool will check each entry in your BibTeX file against Google Scholar.")
-    print("Please be patient as we need to add delays to avoid rate limiting.")
-    print(f"Using delay range: {args.min_delay}-{args.max_delay} seconds between requests\n")
+    print("Please be patient as we need to limit the request rate to avoid rate limiting.")
+    print(f"Using a rate limit of {args.rate} requests per second "
+          f"(adapting up to {args.max_rate or args.rate})")
+    if proxies:
+        print(f"Rotating through {len(proxies)} proxies")
+    print(f"Running up to {args.concurrency} requests concurrently\n")
+    
+    # Progress is logged through a queue so the event loop never blocks on stdout
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    log.setLevel(logging.INFO)
+    log.propagate = False
     
     # Check the BibTeX file
-    results = checker.check_bibtex_file(args.bibtex_file, args.output)
+    listener.start()
+    try:
+        results = asyncio.run(checker.check_bibtex_file_async(args.bibtex_file, args.output))
+    finally:
+        listener.stop()
     
     # Print summary
     checker.print_summary(results)